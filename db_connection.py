@@ -10,15 +10,24 @@ Provides connection pooling, query execution, and configuration management.
 """
 
 import os
+import asyncio
 import time
+import logging
 import re
-from urllib.parse import urlparse
-from typing import Any, Dict, List, Optional, Union
+import functools
+import hashlib
+import itertools
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 try:
     import psycopg2
     from psycopg2 import pool
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extensions import connection as PsycopgConnection, set_wait_callback
+    from psycopg2.extras import wait_select
 except ImportError:
     print("❌ psycopg2 is required. Install it with: pip install psycopg2-binary")
     raise ImportError("psycopg2-binary is required")
@@ -37,14 +46,16 @@ except ImportError:
 
 # Import logging configuration
 try:
-    from logging_config import get_logger
+    from logging_config import get_logger, invalidate as invalidate_logging_config
     logger = get_logger("db-connection")
 except ImportError:
     # Fallback to basic logging if logging_config is not available
-    import logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger("db-connection")
 
+    def invalidate_logging_config():
+        pass
+
 def load_project_dotenv(override: bool = False):
     """
     Load .env file from the project directory.
@@ -62,13 +73,357 @@ def load_project_dotenv(override: bool = False):
     else:
         # Fallback to current directory
         load_dotenv(override=override)
+    
+    # Loggers set up from here on see log settings from the .env file
+    invalidate_logging_config()
 
 # Load initial environment on module import
 load_project_dotenv()
 
+# Number of rows fetched per round when reading query results
+FETCH_BATCH_SIZE = 10000
+
+# Seconds a caller waits for a free pooled connection before giving up
+POOL_WAIT_TIMEOUT = 30
+
+# Most queries accepted in one execute_batch() call
+MAX_BATCH_SIZE = 128
+
+# Name of the server-side cursor used for streamed queries
+STREAM_CURSOR_NAME = 'mcp_stream'
+
+# Server-side prepared statements kept per pooled connection by default
+STATEMENT_CACHE_SIZE = 500
+
+# Statements PostgreSQL can PREPARE (and that return rows)
+_PREPARABLE_RE = re.compile(r'^\s*(?:SELECT|WITH|VALUES)\b', re.IGNORECASE)
+_PARAM_PLACEHOLDER_RE = re.compile(r'%(.?)', re.DOTALL)
+# Explicit type cast right after a placeholder (%s::int)
+_PARAM_CAST_RE = re.compile(r'\s*::')
+
+# SQLSTATEs of a PREPARE that can never succeed, so the query is remembered
+# as unpreparable: syntax error, parameter types that can't be inferred or
+# resolved, statement not supported as a prepared statement
+_UNPREPARABLE_CODES = frozenset({'42601', '42P18', '42P08', '42804', '42725', '0A000'})
+
+# Savepoint that lets a query inside a batch transaction recover from a
+# failed PREPARE or EXECUTE without ending the transaction
+_STATEMENT_SAVEPOINT = 'mcp_statement'
+
+# SQLSTATEs after which a cached prepared statement is dropped and the query
+# retried unprepared: cached plan result type changed, statement vanished
+_STALE_STATEMENT_CODES = frozenset({'0A000', '26000'})
+
+# Read-only validation patterns, compiled once at import
+WRITE_OPERATIONS = (
+    'INSERT', 'UPDATE', 'DELETE', 'UPSERT', 'MERGE',
+    'CREATE', 'ALTER', 'DROP', 'TRUNCATE', 'REPLACE'
+)
+_WRITE_OPS_RE = re.compile(r'\b(?:' + '|'.join(WRITE_OPERATIONS) + r')\b')
+_FORBIDDEN_RE = re.compile(
+    r'\bEXEC\b'               # Execute stored procedures
+    r'|\bCALL\b'              # Call procedures
+    r'|\bDO\b'                # Execute anonymous code blocks
+    r'|\bLOCK\b'              # Table locking
+    r'|\bUNLOCK\b'            # Table unlocking
+)
+# COPY ... FROM (data insertion), matched in two linear steps rather than
+# with a backtracking COPY.*FROM bridge
+_COPY_RE = re.compile(r'\bCOPY\b')
+_FROM_RE = re.compile(r'\bFROM\b')
+_ALLOWED_START_RE = re.compile(
+    r'^\s*(?:(?:SELECT|WITH|SHOW|EXPLAIN|DESCRIBE|DESC)\b'  # Read statements, CTEs, plans
+    r'|\()'                                                 # Subqueries in parentheses
+)
+
+
+# Dollar-quote delimiter ($$ or $tag$); tags are identifiers without '$'
+_DOLLAR_QUOTE_RE = re.compile(r'\$(?:[A-Za-z_\u0080-\U0010ffff][A-Za-z_0-9\u0080-\U0010ffff]*)?\$')
+
+# Whitespace as PostgreSQL's lexer sees it (other Unicode spaces are
+# identifier characters to the server)
+_SQL_WHITESPACE = frozenset(' \t\n\r\f\v')
+# Characters that start an identifier, and those that can only continue a
+# token (digits of numbers or identifiers, '$' of identifiers or parameters)
+_IDENT_START_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_')
+_TOKEN_CONT_CHARS = frozenset('0123456789$')
+
+
+def _normalize_sql(sql: str) -> str:
+    """
+    Normalize SQL for validation in a single pass over the text.
+    Comments are dropped, runs of whitespace collapse to one space, the
+    contents of '...' string literals are blanked out (so keywords inside
+    literals don't trip validation) and the result is uppercased.
+    Whenever the literal boundaries are ambiguous (backslash escapes,
+    unterminated quotes, '$' right after a number) the rest of the query
+    is kept verbatim instead.
+    Args:
+        sql: SQL query string
+    Returns: Normalized SQL string
+    """
+    return _scan_sql(sql, keep_literals=False).upper()
+
+
+def _statement_cache_key(sql: str, params: List) -> str:
+    """
+    Key under which a query's prepared statement is cached: the query with
+    comments dropped and whitespace collapsed outside of quoted text, so
+    reformatted copies of the same query share one statement
+    """
+    return f'{len(params)}:{_scan_sql(sql, keep_literals=True)}'
+
+
+def _scan_sql(sql: str, keep_literals: bool) -> str:
+    """
+    Single-pass SQL scanner behind _normalize_sql and _statement_cache_key
+    Token boundaries follow PostgreSQL's lexer: nested block comments, line
+    comments ending at \\n or \\r, and '$' continuing an identifier rather
+    than opening a dollar quote (a$b$ is a column name).
+    Args:
+        sql: SQL query string
+        keep_literals: Copy string literals (and, when their boundaries are
+                       ambiguous, the rest of the query) exactly instead of
+                       blanking them out
+    Returns: Scanned SQL string
+    """
+    out = []
+    append = out.append
+    length = len(sql)
+    pending_space = False
+    # Kind of the word the previous character belongs to: None outside of a
+    # word, 'identifier', or 'other' (number or $n parameter)
+    word = None
+    i = 0
+    while i < length:
+        char = sql[i]
+        if char == '-' and sql.startswith('--', i):
+            # Line comment: skip to end of line, acts as whitespace
+            end = min((found for found in (sql.find('\n', i + 2), sql.find('\r', i + 2)) if found != -1),
+                      default=length)
+            i = end + 1
+            pending_space = True
+            word = None
+            continue
+        if char == '/' and sql.startswith('/*', i):
+            # Block comment (they nest): skip past the matching closing
+            # marker, acts as whitespace
+            depth = 1
+            i += 2
+            while depth and i < length:
+                if sql.startswith('/*', i):
+                    depth += 1
+                    i += 2
+                elif sql.startswith('*/', i):
+                    depth -= 1
+                    i += 2
+                else:
+                    i += 1
+            if depth:
+                i = length
+            pending_space = True
+            word = None
+            continue
+        if char in _SQL_WHITESPACE:
+            pending_space = True
+            word = None
+            i += 1
+            continue
+        if pending_space and out:
+            append(' ')
+        pending_space = False
+        if char == "'":
+            # String literal: keep the quotes, drop the contents ('' escapes
+            # simply close and reopen the literal)
+            end = sql.find("'", i + 1)
+            if end == -1 or '\\' in sql[i:end]:
+                break
+            append(sql[i:end + 1] if keep_literals else "''")
+            i = end + 1
+            word = None
+            continue
+        if char == '$' and word == 'other':
+            # 1$a$ or $1$a$: a dollar quote to some servers, junk to others
+            break
+        if char == '"' or (char == '$' and word is None):
+            # Quoted identifier or dollar-quoted body: copied as-is, only
+            # scanned so that quotes inside it are not taken as literals
+            if char == '"':
+                quote = '"'
+            else:
+                match = _DOLLAR_QUOTE_RE.match(sql, i)
+                quote = match.group(0) if match else None
+            if quote:
+                end = sql.find(quote, i + len(quote))
+                if end == -1:
+                    break
+                end += len(quote)
+                append(sql[i:end])
+                i = end
+                word = None
+                continue
+        if char in _IDENT_START_CHARS or char >= '\x80':
+            if word is None:
+                word = 'identifier'
+        elif char in _TOKEN_CONT_CHARS:
+            if word is None:
+                word = 'other'
+        else:
+            word = None
+        append(char)
+        i += 1
+    if i < length:
+        append(sql[i:] if keep_literals else ' '.join(sql[i:].split()))
+    return ''.join(out)
+
+
+def _validate_sql(sql: str) -> None:
+    """
+    Validate that SQL query is read-only (SELECT operations only)
+    Args:
+        sql: SQL query string
+    Raises: Exception if the query is not read-only
+    """
+    # Normalize SQL - remove comments, string literals and extra whitespace
+    normalized_sql = _normalize_sql(sql)
+    
+    # Check for write operations
+    match = _WRITE_OPS_RE.search(normalized_sql)
+    if match:
+        raise Exception(f"Write operation '{match.group(0)}' is not allowed. Only read-only operations (SELECT, WITH, SHOW, EXPLAIN, DESCRIBE) are permitted.")
+    
+    # Check for specific forbidden patterns
+    match = _FORBIDDEN_RE.search(normalized_sql)
+    if match:
+        raise Exception(f"Operation matching pattern '{match.group(0)}' is not allowed. Only read-only operations are permitted.")
+    
+    match = _COPY_RE.search(normalized_sql)
+    if match and _FROM_RE.search(normalized_sql, match.end()):
+        raise Exception("Operation matching pattern 'COPY ... FROM' is not allowed. Only read-only operations are permitted.")
+    
+    # Allow specific read operations
+    if not _ALLOWED_START_RE.match(normalized_sql):
+        raise Exception(f"Query type not allowed. Only SELECT, WITH, SHOW, EXPLAIN, and DESCRIBE operations are permitted. Query starts with: {normalized_sql[:50]}...")
+
+
+# Queries longer than this are rejected outright in read-only mode
+MAX_SQL_LENGTH = 1_000_000
+
+# Queries at least this long are validated without going through the cache
+_MAX_CACHED_SQL_LENGTH = 16384
+
+
+@functools.lru_cache(maxsize=2048)
+def _validate_sql_cached(sql: str) -> None:
+    """Cached _validate_sql: repeated query texts are validated only once"""
+    _validate_sql(sql)
+
+
+def validate_read_only_query(sql: str) -> bool:
+    """
+    Validate that SQL query is read-only (SELECT operations only)
+    Needs no database connection, so callers can reject a query before
+    touching the pool.
+    Args:
+        sql: SQL query string
+    Returns: True if query is read-only, raises Exception if not
+    """
+    if len(sql) > MAX_SQL_LENGTH:
+        raise ValueError(f"SQL too large: {len(sql)} characters, at most {MAX_SQL_LENGTH} are allowed in read-only mode.")
+    if len(sql) < _MAX_CACHED_SQL_LENGTH:
+        _validate_sql_cached(sql)
+    else:
+        _validate_sql(sql)
+    return True
+
+
+def read_only_from_env() -> bool:
+    """Read-only mode setting from MCP_POSTGRESQL_READ_ONLY (enabled unless set to 'false')"""
+    return os.getenv('MCP_POSTGRESQL_READ_ONLY', 'true').lower() != 'false'
+
+
+def _get_env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Read an integer setting (at least minimum) from the environment"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        size = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer, got {value!r}')
+    if size < minimum:
+        raise ValueError(f'{name} must be at least {minimum}, got {size}')
+    return size
+
+
+def _prepared_statement_text(sql: str, params: List) -> Optional[str]:
+    """
+    Turn a query into the body of a PREPARE statement
+    psycopg2 placeholders (%s) become $1..$n and %% becomes %. Queries with
+    parameters are only prepared when every placeholder carries an explicit
+    cast (%s::int): the server would otherwise infer parameter types from
+    the query, which can change results compared with the literal values
+    psycopg2 interpolates (COALESCE(%s, 0) with 1.5 would yield 2).
+    Args:
+        sql: SQL query string
+        params: Query parameters
+    Returns: Statement text, or None when the query can't be prepared safely
+    """
+    text = sql.strip().rstrip(';').rstrip()
+    if ';' in text or not _PREPARABLE_RE.match(text):
+        return None  # Multiple statements, or not a preparable statement
+    if not params:
+        # psycopg2 leaves the text alone; skip anything with a % to be safe
+        return None if '%' in text else text
+    
+    position = 0
+    unsupported = False
+    
+    def replace(match):
+        nonlocal position, unsupported
+        if match.group(1) == '%':
+            return '%'
+        if match.group(1) == 's' and _PARAM_CAST_RE.match(match.string, match.end()):
+            position += 1
+            return f'${position}'
+        unsupported = True  # %(name)s, an untyped %s or a stray %
+        return match.group(0)
+    
+    text = _PARAM_PLACEHOLDER_RE.sub(replace, text)
+    if unsupported or position != len(params):
+        return None
+    return text
+
+
+def is_streamable_query(sql: str) -> bool:
+    """Check whether a query can run through a server-side cursor (a single SELECT, WITH or VALUES)"""
+    text = sql.strip().rstrip(';').rstrip()
+    return ';' not in text and bool(_PREPARABLE_RE.match(text))
+
+
+class _StatementCachingConnection(PsycopgConnection):
+    """psycopg2 connection that remembers the prepared statements it holds"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Statement cache key -> prepared statement name (None if it can't be
+        # prepared), least recently used first
+        self.prepared_statements = OrderedDict()
+
 
 class DatabaseConfig:
-    """Database configuration management"""
+    """
+    Database configuration management
+    
+    Pool sizing can be tuned through environment variables:
+    - MCP_POSTGRESQL_MIN_CONN: connections opened up front (default: 2)
+    - MCP_POSTGRESQL_MAX_CONN: upper bound of the pool
+      (default: 4 per CPU, at least 10)
+    - MCP_POSTGRESQL_STATEMENT_CACHE_SIZE: prepared statements kept per
+      connection (default: 500, 0 disables; forced to 0 by ?pgbouncer=true)
+    """
+    
+    __slots__ = ('_config',)
     
     def __init__(self):
         self._config = None
@@ -91,6 +446,14 @@ class DatabaseConfig:
                 'No database URI provided and MCP_POSTGRESQL_DATABASE environment variable is not set.'
             )
         
+        minconn = _get_env_int('MCP_POSTGRESQL_MIN_CONN', 2)
+        maxconn = _get_env_int('MCP_POSTGRESQL_MAX_CONN', max(10, (os.cpu_count() or 4) * 4))
+        statement_cache_size = _get_env_int('MCP_POSTGRESQL_STATEMENT_CACHE_SIZE', STATEMENT_CACHE_SIZE, minimum=0)
+        if maxconn < minconn:
+            raise ValueError(
+                f'MCP_POSTGRESQL_MAX_CONN ({maxconn}) must not be lower than MCP_POSTGRESQL_MIN_CONN ({minconn})'
+            )
+        
         # Parse PostgreSQL URI
         try:
             parsed = urlparse(database_url)
@@ -104,10 +467,15 @@ class DatabaseConfig:
                 'database': parsed.path[1:] if parsed.path else None,  # Remove leading slash
                 'user': parsed.username,
                 'password': parsed.password,
-                'minconn': 1,
-                'maxconn': 20,
+                'minconn': minconn,
+                'maxconn': maxconn,
+                'statement_cache_size': statement_cache_size,
             }
             
+            # Prepared statements don't survive pgbouncer transaction pooling
+            if parse_qs(parsed.query).get('pgbouncer', [''])[0].lower() == 'true':
+                self._config['statement_cache_size'] = 0
+            
             # Validate required fields
             if not all([self._config['host'], self._config['database'], self._config['user']]):
                 raise ValueError('Invalid PostgreSQL URI. Missing required components.')
@@ -121,8 +489,16 @@ class DatabaseConfig:
 class DatabasePool:
     """Database connection pool manager"""
     
+    __slots__ = ('_pool', '_slots', '_init_lock', '_config', 'database_url', 'statement_cache_size')
+    
     def __init__(self, database_url: Optional[str] = None):
         self._pool = None
+        # One slot per pooled connection: callers queue here instead of
+        # getting a PoolError when every connection is checked out
+        self._slots = None
+        # Concurrent first queries (worker threads) must create only one pool
+        self._init_lock = threading.Lock()
+        self.statement_cache_size = 0
         self._config = DatabaseConfig()
         self.database_url = database_url
     
@@ -131,12 +507,19 @@ class DatabasePool:
         if self._pool:
             logger.debug("Database pool already initialized, skipping")
             return
-            
+        
+        with self._init_lock:
+            if self._pool:
+                return  # Another thread initialized it while we waited
+            self._create_pool()
+    
+    def _create_pool(self):
+        """Create the pool (called with _init_lock held)"""
         try:
             db_config = self._config.load_config(self.database_url)
-            logger.info(f"Initializing database connection pool to {db_config['host']}:{db_config['port']}/{db_config['database']}")
+            logger.info("Initializing database connection pool to %s:%s/%s", db_config['host'], db_config['port'], db_config['database'])
             
-            self._pool = psycopg2.pool.ThreadedConnectionPool(
+            pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=db_config['minconn'],
                 maxconn=db_config['maxconn'],
                 host=db_config['host'],
@@ -144,25 +527,64 @@ class DatabasePool:
                 database=db_config['database'],
                 user=db_config['user'],
                 password=db_config['password'],
-                cursor_factory=RealDictCursor
+                **({'connection_factory': _StatementCachingConnection} if db_config['statement_cache_size'] else {})
             )
+            self._slots = threading.BoundedSemaphore(db_config['maxconn'])
+            self.statement_cache_size = db_config['statement_cache_size']
+            # Published last: threads that see the pool also see its settings
+            self._pool = pool
             
-            logger.info(f"Database pool initialized successfully with {db_config['minconn']}-{db_config['maxconn']} connections")
+            logger.info("Database pool initialized successfully with %d-%d connections", db_config['minconn'], db_config['maxconn'])
             
         except Exception as error:
-            logger.error(f"Failed to initialize database pool: {error}", exc_info=True)
+            logger.error("Failed to initialize database pool: %s", error, exc_info=True)
             raise Exception(f'Failed to initialize database pool: {error}')
     
     def get_connection(self):
-        """Get connection from pool"""
+        """Get connection from pool, waiting up to POOL_WAIT_TIMEOUT seconds for a free one"""
         if not self._pool:
             self.initialize()
-        return self._pool.getconn()
+        pool = self._pool
+        slots = self._slots
+        if not slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+            raise Exception(f'Timed out after {POOL_WAIT_TIMEOUT}s waiting for a free database connection')
+        try:
+            return pool.getconn()
+        except Exception:
+            slots.release()
+            raise
     
-    def return_connection(self, connection):
-        """Return connection to pool"""
-        if self._pool and connection:
-            self._pool.putconn(connection)
+    def return_connection(self, connection, discard: bool = False):
+        """Return connection to pool (closing it instead of reusing it if discard is set)"""
+        pool = self._pool
+        slots = self._slots
+        if pool and connection:
+            try:
+                pool.putconn(connection, close=discard)
+            finally:
+                if slots is not None:
+                    slots.release()
+    
+    @contextmanager
+    def connection(self):
+        """
+        Check a connection out of the pool for the duration of a with block.
+        The transaction is committed on success and rolled back on error; the
+        connection always goes back to the pool, broken ones are discarded.
+        """
+        connection = self.get_connection()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            if not connection.closed:
+                try:
+                    connection.rollback()
+                except Exception as rollback_error:
+                    logger.warning("Rollback failed: %s", rollback_error)
+            raise
+        finally:
+            self.return_connection(connection, discard=bool(connection.closed))
     
     def close_all(self):
         """Close all connections in pool"""
@@ -170,21 +592,21 @@ class DatabasePool:
             try:
                 self._pool.closeall()
                 self._pool = None
+                self._slots = None
             except Exception as error:
-                print(f'⚠️  Warning: Error closing database pool: {error}')
+                logger.warning("Error closing database pool: %s", error)
 
 
 class DatabaseExecutor:
     """Database query execution utilities"""
     
+    __slots__ = ('pool', 'read_only', 'write_operations')
+    
     def __init__(self, pool: DatabasePool, read_only: bool = True):
         self.pool = pool
         self.read_only = read_only
         # Define read-only SQL patterns
-        self.write_operations = [
-            'INSERT', 'UPDATE', 'DELETE', 'UPSERT', 'MERGE',
-            'CREATE', 'ALTER', 'DROP', 'TRUNCATE', 'REPLACE'
-        ]
+        self.write_operations = list(WRITE_OPERATIONS)
     
     def validate_read_only_query(self, sql: str) -> bool:
         """
@@ -193,67 +615,27 @@ class DatabaseExecutor:
             sql: SQL query string
         Returns: True if query is read-only, raises Exception if not
         """
-        # Normalize SQL - remove comments and extra whitespace
-        normalized_sql = re.sub(r'--.*?(\n|$)', '', sql, flags=re.MULTILINE)  # Remove line comments
-        normalized_sql = re.sub(r'/\*.*?\*/', '', normalized_sql, flags=re.DOTALL)  # Remove block comments
-        normalized_sql = re.sub(r'\s+', ' ', normalized_sql).strip().upper()  # Normalize whitespace
-        
-        # Check for write operations
-        for operation in self.write_operations:
-            pattern = rf'\b{operation}\b'
-            if re.search(pattern, normalized_sql):
-                raise Exception(f"Write operation '{operation}' is not allowed. Only read-only operations (SELECT, WITH, SHOW, EXPLAIN, DESCRIBE) are permitted.")
-        
-        # Check for specific forbidden patterns
-        forbidden_patterns = [
-            r'\bEXEC\b',  # Execute stored procedures
-            r'\bCALL\b',  # Call procedures
-            r'\bDO\b',    # Execute anonymous code blocks
-            r'\bCOPY\b.*\bFROM\b',  # COPY FROM (data insertion)
-            r'\bLOCK\b',  # Table locking
-            r'\bUNLOCK\b', # Table unlocking
-        ]
-        
-        for pattern in forbidden_patterns:
-            if re.search(pattern, normalized_sql):
-                raise Exception(f"Operation matching pattern '{pattern}' is not allowed. Only read-only operations are permitted.")
-        
-        # Allow specific read operations
-        allowed_start_patterns = [
-            r'^\s*SELECT\b',
-            r'^\s*WITH\b',      # Common Table Expressions (CTEs)
-            r'^\s*SHOW\b',      # Show commands
-            r'^\s*EXPLAIN\b',   # Query plans
-            r'^\s*DESCRIBE\b',  # Describe tables
-            r'^\s*DESC\b',      # Short form of DESCRIBE
-            r'^\s*\(',          # Subqueries in parentheses
-        ]
-        
-        is_allowed = any(re.match(pattern, normalized_sql) for pattern in allowed_start_patterns)
-        
-        if not is_allowed:
-            raise Exception(f"Query type not allowed. Only SELECT, WITH, SHOW, EXPLAIN, and DESCRIBE operations are permitted. Query starts with: {normalized_sql[:50]}...")
-        
-        return True
+        return validate_read_only_query(sql)
     
-    def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict[str, Any]]:
+    def _prepare_query(self, sql: str, params: Optional[List]) -> List:
         """
-        Execute a SQL query using the database pool
+        Log a query about to run and validate it when read-only mode is enabled
         Args:
             sql: SQL query string
             params: Query parameters (optional)
-        Returns: Query results as list of dictionaries
+        Returns: Query parameters to pass to the driver
         """
         if params is None:
             params = []
         
         # Log query execution attempt (truncate for readability)
-        query_preview = sql[:100].replace('\n', ' ').strip()
-        if len(sql) > 100:
-            query_preview += "..."
-        logger.debug(f"Executing query: {query_preview}")
-        if params:
-            logger.debug(f"Query parameters: {params}")
+        if logger.isEnabledFor(logging.DEBUG):
+            query_preview = sql[:100].replace('\n', ' ').strip()
+            if len(sql) > 100:
+                query_preview += "..."
+            logger.debug("Executing query: %s", query_preview)
+            if params:
+                logger.debug("Query parameters: %s", params)
         
         # Validate query is read-only before execution (if read_only mode is enabled)
         if self.read_only:
@@ -261,43 +643,282 @@ class DatabaseExecutor:
                 self.validate_read_only_query(sql)
                 logger.debug("Query validated as read-only")
             except Exception as e:
-                logger.warning(f"Query validation failed: {e}")
+                logger.warning("Query validation failed: %s", e)
                 raise
         
-        connection = None
-        cursor = None
+        return params
+    
+    def _execute(self, connection, cursor, sql: str, params: List, savepoint: bool = False):
+        """
+        Execute a query on a cursor, through a server-side prepared statement
+        when the connection caches them. Repeated queries then skip parsing
+        and planning on the server.
+        Args:
+            connection: Pooled connection the cursor belongs to
+            cursor: Cursor to run the query on
+            sql: SQL query string
+            params: Query parameters
+            savepoint: The query runs inside a longer transaction: recover from
+                       a failed PREPARE or stale statement by rolling back to a
+                       savepoint instead of ending the transaction
+        """
+        prefix = f'SAVEPOINT {_STATEMENT_SAVEPOINT}; ' if savepoint else ''
         
-        try:
-            # Get connection from pool
-            connection = self.pool.get_connection()
-            cursor = connection.cursor()
-            
-            # Execute query
-            start_time = time.time()
+        def recover():
+            if savepoint:
+                cursor.execute(f'ROLLBACK TO SAVEPOINT {_STATEMENT_SAVEPOINT}')
+            else:
+                connection.rollback()
+        
+        statements = getattr(connection, 'prepared_statements', None)
+        if statements is None:
             cursor.execute(sql, params)
-            execution_time = time.time() - start_time
-            
-            # Fetch results if it's a SELECT query
-            if cursor.description:
-                # Convert RealDictRow to regular dict for consistent formatting
-                rows = [dict(row) for row in cursor.fetchall()]
-                logger.info(f"Query executed successfully in {execution_time:.3f}s, returned {len(rows)} rows")
-                return rows
+            return
+        
+        key = _statement_cache_key(sql, params)
+        if key in statements:
+            statements.move_to_end(key)
+            name = statements[key]
+        else:
+            text = _prepared_statement_text(sql, params)
+            if text is None:
+                cursor.execute(sql, params)
+                return
+            if len(statements) >= self.pool.statement_cache_size:
+                _, evicted = statements.popitem(last=False)
+                if evicted:
+                    cursor.execute(f'DEALLOCATE {evicted}')
+            name = 'stmt_' + hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+            try:
+                cursor.execute(f'{prefix}PREPARE {name} AS {text}')
+            except psycopg2.Error as error:
+                recover()
+                if error.pgcode not in _UNPREPARABLE_CODES:
+                    # e.g. missing table or cancelled: the query fails as is too,
+                    # and may prepare fine next time
+                    raise
+                logger.debug("Could not prepare statement, executing directly: %s", error)
+                name = None
+            statements[key] = name
+        
+        if name is None:
+            cursor.execute(sql, params)
+            return
+        try:
+            if params:
+                cursor.execute(f'{prefix}EXECUTE {name} ({", ".join(["%s"] * len(params))})', params)
             else:
-                # This should not happen with read-only queries, but handle gracefully
-                logger.info(f"Query executed successfully in {execution_time:.3f}s, no results returned")
-                return [{'message': 'Query executed successfully, no results returned'}]
+                cursor.execute(f'{prefix}EXECUTE {name}')
+        except psycopg2.Error as error:
+            if error.pgcode not in _STALE_STATEMENT_CODES:
+                raise
+            # Schema changed under the cached plan (or the statement is gone):
+            # forget it and run the query as is
+            logger.debug("Dropping stale prepared statement %s: %s", name, error)
+            recover()
+            del statements[key]
+            if error.pgcode != '26000':
+                cursor.execute(f'DEALLOCATE {name}')
+            cursor.execute(sql, params)
+    
+    def execute_query(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query using the database pool
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            max_rows: Stop fetching after max_rows + 1 rows (optional). Callers
+                      can tell the result was truncated when more than max_rows
+                      rows come back.
+        Returns: Query results as list of dictionaries
+        """
+        params = self._prepare_query(sql, params)
+        
+        try:
+            # Get connection from pool (returned, committed or rolled back on exit)
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                # Execute query
+                start_time = time.perf_counter()
+                self._execute(connection, cursor, sql, params)
+                execution_time = time.perf_counter() - start_time
+                
+                return self._fetch_rows(cursor, max_rows, execution_time)
                 
         except Exception as error:
-            if connection:
-                connection.rollback()
-            logger.error(f"Database query failed: {str(error)}", exc_info=True)
+            logger.error("Database query failed: %s", error)
             raise Exception(f"Database query failed: {str(error)}")
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                self.pool.return_connection(connection)
+    
+    def _fetch_rows(self, cursor, max_rows: Optional[int], execution_time: float) -> List[Dict[str, Any]]:
+        """
+        Fetch the result of an executed query as a list of dictionaries
+        Args:
+            cursor: Cursor the query ran on
+            max_rows: Stop fetching after max_rows + 1 rows (optional)
+            execution_time: Seconds the query took, for logging
+        Returns: Query results as list of dictionaries
+        """
+        # Fetch results if it's a SELECT query
+        if cursor.description:
+            # Build one dict per row from the plain tuple rows, fetching in
+            # batches so tuples for the whole result are never held at once
+            columns = [column.name for column in cursor.description]
+            limit = None if max_rows is None else max_rows + 1
+            rows = []
+            while limit is None or len(rows) < limit:
+                size = FETCH_BATCH_SIZE if limit is None else min(FETCH_BATCH_SIZE, limit - len(rows))
+                batch = cursor.fetchmany(size)
+                if not batch:
+                    break
+                rows.extend([dict(zip(columns, row)) for row in batch])
+            logger.info("Query executed successfully in %.3fs, returned %d rows", execution_time, len(rows))
+            return rows
+        else:
+            # This should not happen with read-only queries, but handle gracefully
+            logger.info("Query executed successfully in %.3fs, no results returned", execution_time)
+            return [{'message': 'Query executed successfully, no results returned'}]
+    
+    def execute_query_columnar(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None,
+                               stream: bool = False) -> Tuple[List[str], List[tuple]]:
+        """
+        Execute a SQL query and return its column names and plain row tuples
+        No dict is built per row, and columns sharing a name are all kept.
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            max_rows: Stop fetching after max_rows + 1 rows (optional)
+            stream: Read the result through a server-side cursor, so the server
+                    sends no more rows than are fetched (SELECT, WITH ... SELECT
+                    and VALUES only)
+        Returns: (column names, rows as tuples of values in column order)
+        """
+        params = self._prepare_query(sql, params)
+        
+        try:
+            with self.pool.connection() as connection, \
+                    connection.cursor(name=STREAM_CURSOR_NAME if stream else None) as cursor:
+                start_time = time.perf_counter()
+                if stream:
+                    cursor.execute(sql, params)
+                else:
+                    self._execute(connection, cursor, sql, params)
+                execution_time = time.perf_counter() - start_time
+                
+                return self._fetch_columns(cursor, max_rows, execution_time)
+                
+        except Exception as error:
+            logger.error("Database query failed: %s", error)
+            raise Exception(f"Database query failed: {str(error)}")
+    
+    def _fetch_columns(self, cursor, max_rows: Optional[int],
+                       execution_time: float) -> Tuple[List[str], List[tuple]]:
+        """
+        Fetch the result of an executed query as column names and row tuples
+        Args:
+            cursor: Cursor the query ran on (server-side cursors included)
+            max_rows: Stop fetching after max_rows + 1 rows (optional)
+            execution_time: Seconds the query took, for logging
+        Returns: (column names, rows as tuples)
+        """
+        # Server-side cursors only describe their result after the first fetch
+        if cursor.name is None and not cursor.description:
+            logger.info("Query executed successfully in %.3fs, no results returned", execution_time)
+            return ['message'], [('Query executed successfully, no results returned',)]
+        
+        limit = None if max_rows is None else max_rows + 1
+        rows = []
+        while limit is None or len(rows) < limit:
+            size = FETCH_BATCH_SIZE if limit is None else min(FETCH_BATCH_SIZE, limit - len(rows))
+            batch = cursor.fetchmany(size)
+            rows.extend(batch)
+            if len(batch) < size:
+                break
+        columns = [column.name for column in cursor.description]
+        logger.info("Query executed successfully in %.3fs, returned %d rows", execution_time, len(rows))
+        return columns, rows
+    
+    def execute_batch(self, queries: Sequence[Tuple[str, Optional[List]]],
+                      max_rows: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several SQL queries on a single pooled connection
+        Every query is validated before any of them runs. In read-only mode
+        the batch runs in one REPEATABLE READ, READ ONLY transaction, so all
+        queries see the same snapshot of the data; otherwise each query is
+        committed as it completes, just like separate execute_query() calls.
+        Args:
+            queries: (sql, params) pairs, at most MAX_BATCH_SIZE of them
+            max_rows: Stop fetching each result after max_rows + 1 rows (optional)
+        Returns: One list of result rows per query, in order
+        """
+        if len(queries) > MAX_BATCH_SIZE:
+            raise ValueError(f"Too many queries in batch: {len(queries)} (max {MAX_BATCH_SIZE})")
+        batch = [(sql, self._prepare_query(sql, params)) for sql, params in queries]
+        
+        results = []
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                if self.read_only:
+                    # READ COMMITTED would take a new snapshot for every query
+                    cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+                for sql, params in batch:
+                    start_time = time.perf_counter()
+                    self._execute(connection, cursor, sql, params, savepoint=self.read_only)
+                    execution_time = time.perf_counter() - start_time
+                    results.append(self._fetch_rows(cursor, max_rows, execution_time))
+                    if not self.read_only:
+                        connection.commit()
+            return results
+        
+        except Exception as error:
+            logger.error("Database batch query %d of %d failed: %s", len(results) + 1, len(batch), error)
+            raise Exception(f"Database query {len(results) + 1} of {len(batch)} failed: {str(error)}")
+    
+    def execute_query_streaming(self, sql: str, params: Optional[List] = None,
+                                chunk_size: int = FETCH_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query through a server-side cursor and yield its rows
+        PostgreSQL sends the result chunk_size rows at a time, so memory stays
+        bounded whatever the result size. Only statements that can back a
+        cursor (SELECT, WITH ... SELECT, VALUES) are supported. The pooled
+        connection is held until the generator is exhausted or closed.
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            chunk_size: Rows fetched from the server per round-trip
+        Returns: Iterator over result rows as dictionaries
+        """
+        params = self._prepare_query(sql, params)
+        return self._stream_rows(sql, params, chunk_size)
+    
+    def _stream_rows(self, sql: str, params: List, chunk_size: int) -> Iterator[Dict[str, Any]]:
+        """Generator behind execute_query_streaming (runs once the query is validated)"""
+        try:
+            with self.pool.connection() as connection, connection.cursor(name=STREAM_CURSOR_NAME) as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(sql, params)
+                columns = None
+                row_count = 0
+                for row in cursor:
+                    if columns is None:
+                        columns = [column.name for column in cursor.description]
+                    row_count += 1
+                    yield dict(zip(columns, row))
+                logger.info("Streamed query completed, returned %d rows", row_count)
+        except Exception as error:
+            logger.error("Database query failed: %s", error)
+            raise Exception(f"Database query failed: {str(error)}")
+    
+    async def execute_query_async(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query without blocking the event loop.
+        The query runs in a worker thread on a pooled connection, so concurrent
+        callers overlap their database round-trips.
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            max_rows: Stop fetching after max_rows + 1 rows (optional)
+        Returns: Query results as list of dictionaries
+        """
+        return await asyncio.to_thread(self.execute_query, sql, params, max_rows)
     
     def format_results_as_table(self, rows: List[Dict[str, Any]]) -> str:
         """
@@ -306,51 +927,112 @@ class DatabaseExecutor:
             rows: Database query results
         Returns: Formatted table string
         """
+        return ''.join(self.iter_format_results_as_table(rows))
+    
+    def iter_format_results_as_table(self, rows: List[Dict[str, Any]],
+                                     chunk_size: int = 1000) -> Iterator[str]:
+        """
+        Format database query results as a readable table, piece by piece
+        Column widths are computed over all rows first, so the output is the
+        same as format_results_as_table(); it is just handed out in pieces that
+        can be written as soon as they are built.
+        Args:
+            rows: Database query results
+            chunk_size: Number of table rows per yielded piece
+        Returns: Iterator of table text pieces (title and header first)
+        """
         if not rows or len(rows) == 0:
-            return '📝 No results found.'
+            yield '📝 No results found.'
+            return
         
         # Get column names
         columns = list(rows[0].keys())
         
+        # Convert every cell to a string once
+        str_rows = [[str(row.get(col, '')) for col in columns] for row in rows]
+        
         # Calculate maximum width for each column
-        max_widths = {}
-        for col in columns:
-            max_widths[col] = max(
-                len(col),
-                max(len(str(row.get(col, ''))) for row in rows)
-            )
+        max_widths = [
+            max(len(col), max(len(str_row[i]) for str_row in str_rows))
+            for i, col in enumerate(columns)
+        ]
         
         # Create header
-        header = ' | '.join(col.ljust(max_widths[col]) for col in columns)
-        separator = '-+-'.join('-' * max_widths[col] for col in columns)
+        header = ' | '.join([col.ljust(width) for col, width in zip(columns, max_widths)])
+        separator = '-+-'.join(['-' * width for width in max_widths])
         
-        # Create rows
-        formatted_rows = []
-        for row in rows:
-            formatted_row = ' | '.join(
-                str(row.get(col, '')).ljust(max_widths[col]) for col in columns
-            )
-            formatted_rows.append(formatted_row)
+        yield f'📊 Results ({len(rows)} row{"" if len(rows) == 1 else "s"}):\n\n{header}\n{separator}'
+        
+        # Create rows, one line per row
+        for start in range(0, len(str_rows), chunk_size):
+            yield ''.join([
+                '\n' + ' | '.join([value.ljust(width) for value, width in zip(str_row, max_widths)])
+                for str_row in str_rows[start:start + chunk_size]
+            ])
+    
+    def format_results_as_table_chunks(self, rows: Iterable[Dict[str, Any]],
+                                       chunk_size: int = 1000) -> Iterator[str]:
+        """
+        Format query results as a table while they are still being fetched
+        Rows are consumed chunk_size at a time, so the first rows can be shown
+        before the query finishes. Column widths come from the first chunk and
+        only grow for later chunks.
+        Args:
+            rows: Database query results (any iterable, e.g. a streamed query)
+            chunk_size: Rows formatted per yielded block
+        Returns: Iterator over formatted text blocks, the row count last
+        """
+        iterator = iter(rows)
+        columns = None
+        max_widths = None
+        row_count = 0
         
-        # Combine everything
-        result = [
-            f'📊 Results ({len(rows)} row{"" if len(rows) == 1 else "s"}):',
-            '',
-            header,
-            separator
-        ] + formatted_rows
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            lines = []
+            if columns is None:
+                # Get column names and print the header once
+                columns = list(chunk[0].keys())
+                max_widths = [len(col) for col in columns]
+            
+            str_rows = [[str(row.get(col, '')) for col in columns] for row in chunk]
+            max_widths = [
+                max(width, max(len(str_row[i]) for str_row in str_rows))
+                for i, width in enumerate(max_widths)
+            ]
+            
+            if row_count == 0:
+                lines += [
+                    '📊 Results:',
+                    '',
+                    ' | '.join([col.ljust(width) for col, width in zip(columns, max_widths)]),
+                    '-+-'.join(['-' * width for width in max_widths])
+                ]
+            lines += [
+                ' | '.join([value.ljust(width) for value, width in zip(str_row, max_widths)])
+                for str_row in str_rows
+            ]
+            row_count += len(chunk)
+            yield '\n'.join(lines)
         
-        return '\n'.join(result)
+        if row_count == 0:
+            yield '📝 No results found.'
+        else:
+            yield f'\n({row_count} row{"" if row_count == 1 else "s"})'
 
 
 class DatabaseManager:
     """High-level database management interface"""
     
+    __slots__ = ('pool', 'executor', '_initialized', 'read_only')
+    
     def __init__(self, database_url: Optional[str] = None, read_only: bool = None):
         if read_only is None:
             # Check environment variable, default to True (read-only mode)
-            read_only_env = os.getenv('MCP_POSTGRESQL_READ_ONLY', 'true')
-            read_only = read_only_env.lower() != 'false'
+            read_only = read_only_from_env()
         
         self.pool = DatabasePool(database_url)
         self.executor = DatabaseExecutor(self.pool, read_only=read_only)
@@ -361,7 +1043,7 @@ class DatabaseManager:
         """Initialize the database manager"""
         if not self._initialized:
             read_only_mode = "enabled" if self.read_only else "disabled"
-            logger.info(f"Initializing DatabaseManager with read-only mode {read_only_mode}")
+            logger.info("Initializing DatabaseManager with read-only mode %s", read_only_mode)
             self.pool.initialize()
             self._initialized = True
             logger.info("DatabaseManager initialized successfully")
@@ -373,22 +1055,92 @@ class DatabaseManager:
             connection = self.pool.get_connection()
             return True
         except Exception as e:
-            print(f"Connection test failed: {e}")
+            logger.warning("Connection test failed: %s", e)
             return False
         finally:
             if connection:
                 self.pool.return_connection(connection)
     
-    def execute_query(self, sql: str, params: Optional[List] = None) -> List[Dict[str, Any]]:
-        """Execute a query and return results"""
+    def execute_query(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Execute a query and return results (at most max_rows + 1 rows if max_rows is set)"""
+        if not self._initialized:
+            self.initialize()
+        return self.executor.execute_query(sql, params, max_rows)
+    
+    def execute_query_streaming(self, sql: str, params: Optional[List] = None,
+                                chunk_size: int = FETCH_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Execute a SELECT query through a server-side cursor and yield its rows"""
+        if not self._initialized:
+            self.initialize()
+        return self.executor.execute_query_streaming(sql, params, chunk_size)
+    
+    def fetch_query_streaming(self, sql: str, params: Optional[List] = None,
+                              max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query through a server-side cursor and collect its rows
+        Only the rows asked for are sent by the server, so memory stays bounded
+        however large the full result is.
+        Args:
+            sql: SQL query string
+            params: Query parameters (optional)
+            max_rows: Stop fetching after max_rows + 1 rows (optional)
+        Returns: Query results as list of dictionaries
+        """
+        limit = None if max_rows is None else max_rows + 1
+        chunk_size = FETCH_BATCH_SIZE if limit is None else min(FETCH_BATCH_SIZE, limit)
+        rows = self.execute_query_streaming(sql, params, chunk_size)
+        try:
+            return list(itertools.islice(rows, limit))
+        finally:
+            # Close the cursor and return the connection without reading the rest
+            rows.close()
+    
+    def execute_query_columnar(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None,
+                               stream: bool = False) -> Tuple[List[str], List[tuple]]:
+        """Execute a query and return its column names and row tuples (at most max_rows + 1 rows if max_rows is set)"""
+        if not self._initialized:
+            self.initialize()
+        return self.executor.execute_query_columnar(sql, params, max_rows, stream)
+    
+    async def execute_query_columnar_async(self, sql: str, params: Optional[List] = None,
+                                           max_rows: Optional[int] = None,
+                                           stream: bool = False) -> Tuple[List[str], List[tuple]]:
+        """Execute a query in a worker thread and return its column names and row tuples"""
+        return await asyncio.to_thread(self.execute_query_columnar, sql, params, max_rows, stream)
+    
+    async def execute_query_async(self, sql: str, params: Optional[List] = None, max_rows: Optional[int] = None,
+                                  stream: bool = False) -> List[Dict[str, Any]]:
+        """Execute a query in a worker thread and return results (through a server-side cursor if stream)"""
+        if stream:
+            return await asyncio.to_thread(self.fetch_query_streaming, sql, params, max_rows)
+        return await asyncio.to_thread(self.execute_query, sql, params, max_rows)
+    
+    def execute_batch(self, queries: Sequence[Tuple[str, Optional[List]]],
+                      max_rows: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """Execute several queries on one connection and return one result list per query"""
         if not self._initialized:
             self.initialize()
-        return self.executor.execute_query(sql, params)
+        return self.executor.execute_batch(queries, max_rows)
+    
+    async def execute_batch_async(self, queries: Sequence[Tuple[str, Optional[List]]],
+                                  max_rows: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """Execute several queries in a worker thread and return one result list per query"""
+        return await asyncio.to_thread(self.execute_batch, queries, max_rows)
     
     def format_results_as_table(self, rows: List[Dict[str, Any]]) -> str:
         """Format query results as a table"""
         return self.executor.format_results_as_table(rows)
     
+    def iter_format_results_as_table(self, rows: List[Dict[str, Any]],
+                                     chunk_size: int = 1000) -> Iterator[str]:
+        """Format query results as a table, handed out in pieces of chunk_size rows"""
+        return self.executor.iter_format_results_as_table(rows, chunk_size)
+    
+    def format_results_as_table_chunks(self, rows: Iterable[Dict[str, Any]],
+                                       chunk_size: int = 1000) -> Iterator[str]:
+        """Format query results as a table, chunk_size rows at a time"""
+        return self.executor.format_results_as_table_chunks(rows, chunk_size)
+    
     def is_read_only(self) -> bool:
         """Check if database manager is in read-only mode"""
         return self.read_only
@@ -399,15 +1151,31 @@ class DatabaseManager:
         self._initialized = False
 
 
+def enable_query_interruption():
+    """
+    Let Ctrl-C cancel a running query instead of blocking until it finishes.
+    Installs psycopg2's wait_select callback for the whole process: on
+    KeyboardInterrupt the query is cancelled on the server and fails with
+    QueryCanceledError, leaving the connection usable.
+    """
+    set_wait_callback(wait_select)
+
+
 # Global instance for backward compatibility
 _global_manager = None
+_global_manager_lock = threading.Lock()
 
 def get_database_manager(read_only: bool = None) -> DatabaseManager:
-    """Get or create the global database manager instance"""
+    """Get or create the global database manager instance (thread-safe)"""
     global _global_manager
-    if _global_manager is None:
-        _global_manager = DatabaseManager(read_only=read_only)
-    return _global_manager
+    manager = _global_manager
+    if manager is None:
+        with _global_manager_lock:
+            # Re-check under the lock so concurrent callers share one manager
+            if _global_manager is None:
+                _global_manager = DatabaseManager(read_only=read_only)
+            manager = _global_manager
+    return manager
 
 def initialize_database():
     """Initialize the global database manager (backward compatibility)"""
@@ -422,6 +1190,7 @@ def execute_db_query(sql: str, params: Optional[List] = None) -> List[Dict[str,
 def close_database_connection():
     """Close database connections (backward compatibility)"""
     global _global_manager
-    if _global_manager:
-        _global_manager.close()
-        _global_manager = None
+    with _global_manager_lock:
+        manager, _global_manager = _global_manager, None
+    if manager:
+        manager.close()
@@ -9,16 +9,21 @@ from common project configuration files.
 
 import os
 import json
+import functools
 import re
+import tomllib
 import yaml
-import toml
 import configparser
+import psycopg2
 from pathlib import Path
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
-from db_connection import DatabaseManager
 from project_utils import get_project_path, get_project_path_as_path
+from logging_config import get_logger
+
+logger = get_logger("db-discovery")
 
 # Supported file types and their parsers
 SUPPORTED_FILES = {
@@ -31,6 +36,14 @@ SUPPORTED_FILES = {
     '.conf': 'ini',
 }
 
+SUPPORTED_SUFFIXES = frozenset(SUPPORTED_FILES)
+
+# Directories that are never scanned
+EXCLUDED_DIRS = frozenset({'.venv', 'venv', '.git', '__pycache__', 'node_modules'})
+
+# Use libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 # Regex patterns for database URIs
 POSTGRES_URI_PATTERN = re.compile(r"postgres(?:ql)?://[^\s'\"`]+")
 
@@ -39,18 +52,26 @@ def _extract_uris_from_string(content: str) -> List[str]:
     """Extracts PostgreSQL URIs from a string."""
     return POSTGRES_URI_PATTERN.findall(content)
 
+def _extract_uris_from_file(file_path: Path) -> List[str]:
+    """Extracts PostgreSQL URIs from a file without reading it into memory at once."""
+    uris = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            uris.extend(POSTGRES_URI_PATTERN.findall(line))
+    return uris
+
 def _find_uris_in_obj(obj: Any) -> List[str]:
-    """Recursively finds PostgreSQL URIs in a Python object (dict, list, etc.)."""
+    """Finds PostgreSQL URIs in a Python object (dict, list, etc.), walking nested values iteratively."""
     uris = []
-    if isinstance(obj, dict):
-        for value in obj.values():
-            if isinstance(value, str):
-                uris.extend(_extract_uris_from_string(value))
-            elif isinstance(value, (dict, list)):
-                uris.extend(_find_uris_in_obj(value))
-    elif isinstance(obj, list):
-        for item in obj:
-            uris.extend(_find_uris_in_obj(item))
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            uris.extend(POSTGRES_URI_PATTERN.findall(node))
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
     return uris
 
 def _parse_json(content: str) -> List[str]:
@@ -62,31 +83,41 @@ def _parse_json(content: str) -> List[str]:
 
 def _parse_yaml(content: str) -> List[str]:
     try:
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=_YAML_LOADER)
         return _find_uris_in_obj(data)
     except yaml.YAMLError:
         return []
 
 def _parse_toml(content: str) -> List[str]:
     try:
-        data = toml.loads(content)
+        data = tomllib.loads(content)
         return _find_uris_in_obj(data)
-    except toml.TomlDecodeError:
+    except tomllib.TOMLDecodeError:
         return []
 
+# Parameter mappings for different naming conventions
+PARAM_MAPPINGS = {
+    'host': ['host', 'hostname', 'server'],
+    'port': ['port'],
+    'user': ['user', 'username', 'dbuser'],
+    'password': ['pass', 'password', 'dbpass', 'pwd'],
+    'database': ['name', 'dbname', 'database', 'db'],
+}
+
+# Reverse lookup: parameter name variant -> standard parameter name
+_VARIANT_TO_PARAM = {
+    variant: std_param
+    for std_param, variants in PARAM_MAPPINGS.items()
+    for variant in variants
+}
+
+# Key prefixes that never describe a PostgreSQL database
+NON_DATABASE_PREFIXES = frozenset({'cdn', 'memcached', 'sphinx', 'elastic', 'ftp', 'mongo'})
+
 def _extract_db_parameters(config_dict: Dict[str, str]) -> Dict[str, Dict[str, str]]:
     """Extract database parameters and group them by database identifier."""
     db_groups = {}
     
-    # Parameter mappings for different naming conventions
-    param_mappings = {
-        'host': ['host', 'hostname', 'server'],
-        'port': ['port'],
-        'user': ['user', 'username', 'dbuser'],
-        'password': ['pass', 'password', 'dbpass', 'pwd'],
-        'database': ['name', 'dbname', 'database', 'db'],
-    }
-    
     for key, value in config_dict.items():
         if not value or value.startswith('#'):
             continue
@@ -96,26 +127,19 @@ def _extract_db_parameters(config_dict: Dict[str, str]) -> Dict[str, Dict[str, s
             prefix, param = key.split('.', 1)
             
             # Skip non-database prefixes
-            if prefix in ['cdn', 'memcached', 'sphinx', 'elastic', 'ftp', 'mongo']:
+            if prefix in NON_DATABASE_PREFIXES:
                 continue
-                
-            if prefix not in db_groups:
-                db_groups[prefix] = {}
-                
-            # Map parameter names to standard names
-            for std_param, variants in param_mappings.items():
-                if param.lower() in variants:
-                    db_groups[prefix][std_param] = value
-                    break
         else:
             # Handle simple parameters (no prefix)
-            if 'default' not in db_groups:
-                db_groups['default'] = {}
-                
-            for std_param, variants in param_mappings.items():
-                if key.lower() in variants:
-                    db_groups['default'][std_param] = value
-                    break
+            prefix, param = 'default', key
+            
+        if prefix not in db_groups:
+            db_groups[prefix] = {}
+            
+        # Map parameter names to standard names
+        std_param = _VARIANT_TO_PARAM.get(param.lower())
+        if std_param:
+            db_groups[prefix][std_param] = value
     
     return db_groups
 
@@ -147,23 +171,25 @@ def _parse_ini(content: str) -> List[str]:
     """Parses INI/CFG content and extracts potential database URIs."""
     uris = []
     
-    # First, try to extract complete URIs using regex
+    # Parse once with configparser, collecting complete URIs and a flat view of
+    # the keys (prefixed with their section) for parameter-based URIs
     try:
-        config = configparser.ConfigParser()
+        config = configparser.ConfigParser(interpolation=None, strict=False)
         config.read_string(content)
+        config_dict = dict(config.defaults())
         for section in config.sections():
             for key, value in config.items(section):
                 uris.extend(_extract_uris_from_string(value))
+                config_dict[key if '.' in key else f'{section}.{key}'] = value
     except configparser.Error:
-        pass # Ignore parsing errors
-    
-    # Parse as key-value pairs (like .conf files)
-    config_dict = {}
-    for line in content.split('\n'):
-        line = line.strip()
-        if line and not line.startswith('#') and '=' in line:
-            key, value = line.split('=', 1)
-            config_dict[key.strip()] = value.strip()
+        # Not valid INI (e.g. .conf files without sections): parse as key-value pairs
+        config_dict = {}
+        for line in content.split('\n'):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                key, sep, value = line.partition('=')
+                if sep:
+                    config_dict[key.strip()] = value.strip()
     
     # Extract database parameters and construct URIs
     if config_dict:
@@ -175,22 +201,66 @@ def _parse_ini(content: str) -> List[str]:
     
     return uris
 
+# Structured parsers by file suffix
+FILE_PARSERS = {
+    '.json': _parse_json,
+    '.yaml': _parse_yaml,
+    '.yml': _parse_yaml,
+    '.toml': _parse_toml,
+    '.ini': _parse_ini,
+    '.cfg': _parse_ini,
+    '.conf': _parse_ini,
+}
+
+def _walk_config_files(root: str):
+    """Yields supported configuration files below root, skipping excluded directories."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Directory symlinks are not followed (no loops), file symlinks are
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        name = entry.name
+                        if name.startswith('.env') or os.path.splitext(name)[1] in SUPPORTED_SUFFIXES:
+                            yield Path(entry.path)
+        except OSError:
+            continue  # Unreadable directory, like os.walk does
+
 def scan_for_config_files() -> List[Path]:
     """Scans the project directory for supported configuration files."""
-    found_files = []
-    project_path = get_project_path()
-    for root, _, files in os.walk(project_path):
-        if '.venv' in root or 'venv' in root or '.git' in root or '__pycache__' in root:
-            continue
-        for file in files:
-            file_path = Path(root) / file
-            if file_path.suffix in SUPPORTED_FILES or file_path.name.startswith('.env'):
-                found_files.append(file_path)
-    return found_files
+    return list(_walk_config_files(get_project_path()))
+
+def _discover_file_uris(file_path: Path) -> List[str]:
+    """Reads a single configuration file and returns the PostgreSQL URIs found in it."""
+    parser = FILE_PARSERS.get(file_path.suffix)
+    if not parser:
+        # No structured parser (.env files etc.): scan line by line
+        return _extract_uris_from_file(file_path)
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    uris = parser(content)
+    # Fall back to a raw regex scan only if the parser found nothing
+    if not uris:
+        uris = _extract_uris_from_string(content)
+    return uris
+
+def _discover_file_uris_safe(file_path: Path):
+    """Worker wrapper around _discover_file_uris returning (path, uris, error)."""
+    try:
+        return file_path, _discover_file_uris(file_path), None
+    except Exception as e:
+        return file_path, [], e
 
 def discover_database_configs() -> List[Dict[str, Any]]:
     """
     Discovers database configurations by scanning and parsing files.
+    Files are read and parsed concurrently; results are merged on the calling thread.
     """
     config_files = scan_for_config_files()
     all_configs = []
@@ -198,41 +268,26 @@ def discover_database_configs() -> List[Dict[str, Any]]:
     # Use a set to avoid adding duplicate URIs from the same file
     seen_configs = set()
 
-    for file_path in config_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            uris = []
-            parser_map = {
-                '.json': _parse_json,
-                '.yaml': _parse_yaml,
-                '.yml': _parse_yaml,
-                '.toml': _parse_toml,
-                '.ini': _parse_ini,
-                '.cfg': _parse_ini,
-                '.conf': _parse_ini,
-            }
-            parser = parser_map.get(file_path.suffix)
-            if parser:
-                uris.extend(parser(content))
-
-            # Also do a raw regex scan as a fallback for all file types
-            uris.extend(_extract_uris_from_string(content))
-
-            if uris:
-                for uri in set(uris):
-                    config_tuple = (str(file_path), uri)
-                    if config_tuple not in seen_configs:
-                        all_configs.append({
-                            'source': str(file_path),
-                            'uri': uri,
-                        })
-                        seen_configs.add(config_tuple)
-
-        except Exception as e:
-            print(f"Could not read or parse {file_path}: {e}")
-            continue
+    if not config_files:
+        return all_configs
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(config_files))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_discover_file_uris_safe, config_files)
+
+        for file_path, uris, error in results:
+            if error is not None:
+                logger.warning("Could not read or parse %s: %s", file_path, error)
+                continue
+
+            for uri in set(uris):
+                config_tuple = (str(file_path), uri)
+                if config_tuple not in seen_configs:
+                    all_configs.append({
+                        'source': str(file_path),
+                        'uri': uri,
+                    })
+                    seen_configs.add(config_tuple)
     
     # Sort by source path for consistent ordering
     return sorted(all_configs, key=lambda x: x['source'])
@@ -241,14 +296,28 @@ def list_config_files() -> List[str]:
     """Returns a list of all found configuration files."""
     return [str(p) for p in scan_for_config_files()]
 
-def validate_database_config(uri: str) -> bool:
-    """Validates a database URI by attempting to connect."""
+# Seconds to wait for a server while probing a candidate URI
+PROBE_CONNECT_TIMEOUT = 2
+
+@functools.lru_cache(maxsize=64)
+def _probe_connection(uri: str) -> None:
+    """Opens and closes a single connection, raising on failure; successes are cached."""
+    connection = psycopg2.connect(uri, connect_timeout=PROBE_CONNECT_TIMEOUT)
+    connection.close()
+
+def _quick_probe(uri: str) -> bool:
+    """Checks that a database URI accepts connections, without building a pool."""
     try:
-        db_manager = DatabaseManager(database_url=uri)
-        return db_manager.test_connection()
-    except Exception:
+        _probe_connection(uri)
+        return True
+    except Exception as e:
+        logger.debug("Connection probe failed for candidate URI: %s", e)
         return False
 
+def validate_database_config(uri: str) -> bool:
+    """Validates a database URI by attempting to connect."""
+    return _quick_probe(uri)
+
 def backup_env_file() -> Optional[str]:
     """Backs up the .env file if it exists, returning the backup path."""
     env_path = get_project_path_as_path() / '.env'
@@ -262,19 +331,26 @@ def backup_env_file() -> Optional[str]:
 def setup_database_config(uri: str):
     """Creates or updates the .env file with the given database URI."""
     env_path = get_project_path_as_path() / '.env'
-    with open(env_path, 'a+') as f:
-        f.seek(0)
-        lines = f.readlines()
-        
-        # Remove existing MCP_POSTGRESQL_DATABASE and MCP_DATABASE lines
-        lines = [line for line in lines if not (line.strip().startswith('MCP_POSTGRESQL_DATABASE=') or line.strip().startswith('MCP_DATABASE='))]
-        
-        # Add the new line with preferred variable name
-        lines.append(f'MCP_POSTGRESQL_DATABASE={uri}\n')
-        
-        f.seek(0)
-        f.truncate()
-        f.writelines(lines)
+    lines = env_path.read_text(encoding='utf-8').splitlines(keepends=True) if env_path.exists() else []
+    
+    # Remove existing MCP_POSTGRESQL_DATABASE and MCP_DATABASE lines
+    lines = [line for line in lines if not (line.strip().startswith('MCP_POSTGRESQL_DATABASE=') or line.strip().startswith('MCP_DATABASE='))]
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    
+    # Add the new line with preferred variable name
+    lines.append(f'MCP_POSTGRESQL_DATABASE={uri}\n')
+    
+    # Write to a temporary file and swap it in, so readers never see a partial .env
+    tmp_path = env_path.with_name('.env.tmp')
+    try:
+        tmp_path.write_text(''.join(lines), encoding='utf-8')
+        if env_path.exists():
+            shutil.copymode(env_path, tmp_path)
+        os.replace(tmp_path, env_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 if __name__ == '__main__':
     print("🔍 Starting database configuration discovery...")
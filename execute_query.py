@@ -18,16 +18,22 @@ Environment variable:
 """
 
 import sys
-import argparse
 import time
 from pathlib import Path
-import readline
 import os
-import hashlib
+import re
+import itertools
+from typing import Iterable
 
-# Import our shared libraries
+# Import our shared libraries (readline is imported where it is used)
 try:
-    from db_connection import DatabaseManager
+    from db_connection import (
+        enable_query_interruption,
+        get_database_manager,
+        initialize_database as _init_db,
+        execute_db_query as _exec_q,
+        close_database_connection as _close_db,
+    )
     from project_utils import get_project_path, get_project_path_as_path
     from logging_config import get_logger
     
@@ -38,13 +44,86 @@ except ImportError as e:
     print("Make sure db_connection.py, project_utils.py, and logging_config.py are in the same directory.")
     sys.exit(1)
 
+# Rows fetched and printed per chunk when streaming query results
+STREAM_CHUNK_SIZE = 1000
+
+# Queries whose results are streamed instead of buffered (leading comments skipped)
+STREAMABLE_QUERY_PATTERN = re.compile(
+    r'^\s*(?:(?:--[^\n]*(?:\n|$)|/\*(?:[^*]|\*(?!/))*\*/)\s*)*(?:select|with)\b',
+    re.IGNORECASE,
+)
+
+# Rows shown per page for read-only queries in interactive mode
+INTERACTIVE_PAGE_SIZE = 100
+
+# Queries kept in the history file
+HISTORY_LENGTH = 50
+
+# SQL keywords offered by tab completion, next to table and column names
+SQL_KEYWORDS = (
+    'SELECT', 'FROM', 'WHERE', 'AND', 'OR', 'NOT', 'IN', 'IS', 'NULL', 'LIKE',
+    'ILIKE', 'BETWEEN', 'EXISTS', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL',
+    'OUTER', 'CROSS', 'ON', 'USING', 'GROUP', 'BY', 'ORDER', 'HAVING', 'LIMIT',
+    'OFFSET', 'DISTINCT', 'AS', 'ASC', 'DESC', 'UNION', 'ALL', 'WITH', 'CASE',
+    'WHEN', 'THEN', 'ELSE', 'END', 'COUNT', 'SUM', 'AVG', 'MIN', 'MAX',
+    'INSERT', 'INTO', 'VALUES', 'UPDATE', 'SET', 'DELETE', 'RETURNING',
+    'EXPLAIN', 'ANALYZE', 'SHOW',
+)
+
+# Table and column names offered by tab completion
+COMPLETION_NAMES_QUERY = """
+    SELECT DISTINCT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+"""
+
+# Characters that end a word for tab completion
+COMPLETER_DELIMS = ' \t\n()[],;=<>!+-*/%|\'"'
+
+def _write_output(chunks: Iterable[str]):
+    """
+    Write text chunks to stdout as soon as each one is ready.
+    Chunks are encoded once and written to the underlying binary buffer,
+    bypassing the text layer; stdout is flushed first to keep print() output
+    in order.
+    """
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        # stdout was replaced by a text-only stream
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.flush()
+        return
+    
+    encoding = sys.stdout.encoding or 'utf-8'
+    errors = sys.stdout.errors or 'strict'
+    sys.stdout.flush()
+    for chunk in chunks:
+        buffer.write(chunk.encode(encoding, errors))
+        buffer.flush()
+
+def _is_multi_statement(sql: str) -> bool:
+    """Check whether SQL text may hold more than one statement (a trailing ; is ignored)"""
+    return ';' in sql.strip().rstrip(';')
+
 class QueryExecutor:
     """Command-line query execution interface"""
     
-    def __init__(self):
-        self.db_manager = DatabaseManager()
+    def __init__(self, page_size: int = INTERACTIVE_PAGE_SIZE):
+        # Share the process-wide manager (and its pool and statement caches)
+        self.db_manager = get_database_manager()
         self.history_file = self._get_project_history_file()
         self.query_history = []
+        self.page_size = page_size
+        # Query currently being paged through in interactive mode
+        self._page_query = None
+        self._page_offset = 0
+        self._page_has_more = False
+        # Tab-completion words, loaded from the database on first use
+        self._completion_words = None
+        self._completion_matches = []
+        # Queries added to the history since it was last saved
+        self._unsaved_history_entries = 0
         self._setup_readline()
     
     def _get_project_history_file(self):
@@ -65,37 +144,111 @@ class QueryExecutor:
     def _setup_readline(self):
         """Configure readline for command history and completion"""
         try:
+            import readline
+            
             # Load history from file if it exists
             if os.path.exists(self.history_file):
                 readline.read_history_file(self.history_file)
                 
             # Set history size to 50 queries max
-            readline.set_history_length(50)
+            readline.set_history_length(HISTORY_LENGTH)
+            
+            # Only _add_to_history() records queries, so duplicates are skipped
+            readline.set_auto_history(False)
             
-            # Enable tab completion (optional)
-            readline.parse_and_bind("tab: complete")
+            # Complete SQL keywords, table and column names on tab
+            readline.set_completer(self._complete)
+            readline.set_completer_delims(COMPLETER_DELIMS)
+            if 'libedit' in (readline.__doc__ or ''):
+                readline.parse_and_bind("bind ^I rl_complete")
+            else:
+                readline.parse_and_bind("tab: complete")
             
         except Exception as e:
             # readline might not be available on all systems
             print(f"⚠️  History feature may not work properly: {e}")
     
+    def _get_completion_words(self) -> list:
+        """Load the tab-completion words once: SQL keywords plus table and column names"""
+        if self._completion_words is None:
+            names = set()
+            try:
+                for row in self.db_manager.execute_query(COMPLETION_NAMES_QUERY):
+                    names.add(row['table_name'])
+                    names.add(row['column_name'])
+            except Exception as e:
+                logger.debug("Could not load completion names: %s", e)
+            self._completion_words = sorted(names) + list(SQL_KEYWORDS)
+        return self._completion_words
+    
+    def _complete(self, text: str, state: int):
+        """readline completer: return the state-th word starting with text"""
+        if state == 0:
+            prefix = text.lower()
+            # Keywords follow the case the user is typing in
+            lower = text.islower()
+            self._completion_matches = [
+                word.lower() if lower and word in SQL_KEYWORDS else word
+                for word in self._get_completion_words()
+                if word.lower().startswith(prefix)
+            ]
+        if state < len(self._completion_matches):
+            return self._completion_matches[state]
+        return None
+    
     def _save_history(self):
-        """Save command history to file"""
+        """
+        Save command history to file.
+        Only the entries added since the last save are appended; readline
+        trims the file to HISTORY_LENGTH entries as it appends.
+        """
+        if self._unsaved_history_entries <= 0:
+            return  # Nothing new (or no readline to record history)
         try:
-            readline.write_history_file(self.history_file)
+            import readline
+            
+            if os.path.exists(self.history_file):
+                readline.append_history_file(min(self._unsaved_history_entries, HISTORY_LENGTH), self.history_file)
+            else:
+                readline.write_history_file(self.history_file)
+            self._unsaved_history_entries = 0
         except Exception as e:
             print(f"⚠️  Could not save history: {e}")
     
     def _add_to_history(self, query: str):
         """Add query to history (avoiding duplicates of last command, max 50 queries)"""
+        try:
+            import readline
+        except ImportError:
+            readline = None  # Keep the in-memory history only
+        
         query = query.strip()
-        if query and (not self.query_history or self.query_history[-1] != query):
+        if readline is not None:
+            last_query = readline.get_history_item(readline.get_current_history_length())
+        else:
+            last_query = self.query_history[-1] if self.query_history else None
+        if query and query != last_query:
             # Maintain max 50 queries in our internal history
-            if len(self.query_history) >= 50:
+            if len(self.query_history) >= HISTORY_LENGTH:
                 self.query_history.pop(0)  # Remove oldest query
             
             self.query_history.append(query)
-            readline.add_history(query)
+            if readline is not None:
+                readline.add_history(query)
+                self._unsaved_history_entries += 1
+    
+    def _can_stream(self, sql_query: str) -> bool:
+        """
+        Check whether a query can be streamed through a server-side cursor.
+        Only single SELECT/WITH queries qualify, and only in read-only mode so
+        that data-modifying CTEs never end up in a cursor. Multi-statement
+        scripts are sent to the server as one batch instead.
+        """
+        return (
+            self.db_manager.is_read_only()
+            and bool(STREAMABLE_QUERY_PATTERN.match(sql_query))
+            and not _is_multi_statement(sql_query)
+        )
     
     def execute_query_with_output(self, sql_query: str, params=None):
         """
@@ -118,26 +271,111 @@ class QueryExecutor:
         if params:
             print(f'📋 Parameters: {params}')
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            logger.debug(f"Executing query: {trimmed_query[:100]}...")
+            logger.debug("Executing query: %s...", trimmed_query[:100])
             if params:
-                logger.debug(f"Query parameters: {params}")
+                logger.debug("Query parameters: %s", params)
+            
+            if self._can_stream(trimmed_query):
+                # Print rows as they arrive from a server-side cursor
+                rows = self.db_manager.execute_query_streaming(trimmed_query, params, chunk_size=STREAM_CHUNK_SIZE)
+                print('')
+                _write_output(
+                    block + '\n'
+                    for block in self.db_manager.format_results_as_table_chunks(rows, STREAM_CHUNK_SIZE)
+                )
+                execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000  # Convert to milliseconds
+                
+                logger.info("Streamed query executed successfully in %dms", execution_time)
+            else:
+                results = self.db_manager.execute_query(trimmed_query, params)
+                execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000  # Convert to milliseconds
+                
+                logger.info("Query executed successfully in %dms, returned %d rows", execution_time, len(results) if results else 0)
+                
+                self._print_table(results)
+            print(f'\n⏱️  Query executed in {execution_time}ms\n')
             
-            results = self.db_manager.execute_query(trimmed_query, params)
-            execution_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
+        except KeyboardInterrupt:
+            # Raised between fetches while streaming: stop and drop the cursor
+            logger.info("Query output interrupted by user")
+            print('\n⛔ Query cancelled.\n')
+        except Exception as error:
+            logger.error("Query execution failed: %s", error, exc_info=True)
+            print('❌ Query execution failed:')
+            print(f'   Error: {str(error)}')
+            print('')
+    
+    def _print_table(self, results):
+        """Print query results as a table, writing it out STREAM_CHUNK_SIZE rows at a time"""
+        print('')
+        _write_output(itertools.chain(
+            self.db_manager.iter_format_results_as_table(results, STREAM_CHUNK_SIZE),
+            ('\n',),
+        ))
+    
+    def _paginate(self, sql_query: str, offset: int):
+        """
+        Wrap a read-only query so that it returns a single page of rows.
+        One row more than the page size is requested to tell whether another
+        page follows.
+        Returns: The wrapped query, or None if the query can't be paginated
+        """
+        body = sql_query.strip().rstrip(';').rstrip()
+        if self.page_size <= 0 or not self._can_stream(body):
+            return None
+        # The newline keeps a trailing -- comment from swallowing the wrapper
+        return f'SELECT * FROM (\n{body}\n) AS _q LIMIT {self.page_size + 1} OFFSET {offset}'
+    
+    def execute_page_with_output(self, sql_query: str, offset: int = 0) -> bool:
+        """
+        Executes one page of a read-only query and displays it with timing
+        Args:
+            sql_query: The SQL query to page through
+            offset: Number of rows to skip
+        Returns: True if more rows follow this page
+        """
+        trimmed_query = sql_query.strip()
+        print(f'🔍 Executing query: {trimmed_query}')
+        
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            results = self.db_manager.execute_query(self._paginate(trimmed_query, offset))
+            execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000  # Convert to milliseconds
             
-            logger.info(f"Query executed successfully in {execution_time}ms, returned {len(results) if results else 0} rows")
+            has_more = len(results) > self.page_size
+            results = results[:self.page_size]
+            logger.info("Query page executed successfully in %dms, returned %d rows at offset %d", execution_time, len(results), offset)
             
-            print('\n' + self.db_manager.format_results_as_table(results))
+            self._print_table(results)
+            if results:
+                hints = []
+                if has_more:
+                    hints.append('"next" for more')
+                if offset > 0:
+                    hints.append('"prev" to go back')
+                print(f'\n📄 Rows {offset + 1}-{offset + len(results)}' + (f' (type {" or ".join(hints)})' if hints else ''))
             print(f'\n⏱️  Query executed in {execution_time}ms\n')
+            return has_more
             
+        except KeyboardInterrupt:
+            logger.info("Query page interrupted by user")
+            print('\n⛔ Query cancelled.\n')
+            return False
         except Exception as error:
-            logger.error(f"Query execution failed: {str(error)}", exc_info=True)
+            logger.error("Query execution failed: %s", error, exc_info=True)
             print('❌ Query execution failed:')
             print(f'   Error: {str(error)}')
             print('')
+            return False
+    
+    def _show_page(self, offset: int):
+        """Display the given page of the query being paged through"""
+        self._page_offset = offset
+        self._page_has_more = self.execute_page_with_output(self._page_query, offset)
     
     def start_interactive_mode(self):
         """
@@ -146,11 +384,15 @@ class QueryExecutor:
         print('🎯 Interactive SQL Query Mode')
         print('Enter SQL queries (type "exit" or "quit" to leave):')
         print('Use ↑/↓ arrow keys to navigate query history')
+        print('Press Ctrl-C to cancel a running query')
         print('Examples:')
         print('  SELECT * FROM users LIMIT 5;')
         print('  SELECT COUNT(*) FROM users;')
         print('')
         
+        # Ctrl-C cancels the running query and returns to the prompt
+        enable_query_interruption()
+        
         try:
             while True:
                 try:
@@ -163,16 +405,39 @@ class QueryExecutor:
                     if user_input.lower() == 'help':
                         print('Available commands:')
                         print('  help     - Show this help message')
+                        print('  next     - Show the next page of the last query')
+                        print('  prev     - Show the previous page of the last query')
                         print('  exit     - Exit interactive mode')
                         print('  quit     - Exit interactive mode')
                         print('  ↑/↓      - Navigate query history')
+                        print('  Tab      - Complete keywords, table and column names')
+                        print('  Ctrl-C   - Cancel the running query')
                         print('')
                         continue
                     
+                    if user_input.lower() in ['next', 'prev']:
+                        if self._page_query is None:
+                            print('❌ No paginated query to page through.\n')
+                        elif user_input.lower() == 'next':
+                            if self._page_has_more:
+                                self._show_page(self._page_offset + self.page_size)
+                            else:
+                                print('📄 Already on the last page.\n')
+                        elif self._page_offset > 0:
+                            self._show_page(max(0, self._page_offset - self.page_size))
+                        else:
+                            print('📄 Already on the first page.\n')
+                        continue
+                    
                     if user_input:
                         # Add to history before execution
                         self._add_to_history(user_input)
-                        self.execute_query_with_output(user_input)
+                        if self._paginate(user_input, 0):
+                            self._page_query = user_input
+                            self._show_page(0)
+                        else:
+                            self._page_query = None
+                            self.execute_query_with_output(user_input)
                         
                 except KeyboardInterrupt:
                     print('\n👋 Shutting down gracefully...')
@@ -187,33 +452,36 @@ class QueryExecutor:
     def execute_from_file(self, file_path: str):
         """
         Reads and executes SQL from a file
+        The whole file is sent as a single batch, so a script of N statements
+        costs one round-trip rather than N; the result of the last statement
+        is displayed.
         Args:
             file_path: Path to the SQL file
         """
         try:
             file_path = Path(file_path).resolve()
-            logger.info(f"Attempting to execute SQL from file: {file_path}")
+            logger.info("Attempting to execute SQL from file: %s", file_path)
             
             if not file_path.exists():
-                logger.error(f"SQL file not found: {file_path}")
+                logger.error("SQL file not found: %s", file_path)
                 print(f'❌ File not found: {file_path}')
                 return
             
             with open(file_path, 'r', encoding='utf-8') as file:
                 sql_content = file.read()
             
-            logger.info(f"Successfully read SQL file: {file_path}, content length: {len(sql_content)} chars")
+            logger.info("Successfully read SQL file: %s, content length: %d chars", file_path, len(sql_content))
             print(f'📁 Reading SQL from: {file_path}')
             self.execute_query_with_output(sql_content)
             
         except Exception as error:
-            logger.error(f"Failed to read SQL file: {file_path}, error: {error}", exc_info=True)
+            logger.error("Failed to read SQL file: %s, error: %s", file_path, error, exc_info=True)
             print(f'❌ Failed to read file: {error}')
     
     def close(self):
         """Close database connections and save history"""
         self._save_history()
-        self.db_manager.close()
+        _close_db()
 
 
 def show_help():
@@ -231,6 +499,8 @@ def show_help():
     print('Interactive Mode Features:')
     print('  • Use ↑/↓ arrow keys to navigate query history')
     print('  • Query history is persistent across sessions')
+    print('  • SELECT results are paged, type "next"/"prev" to move between pages')
+    print('  • Ctrl-C cancels a running query without leaving the session')
     print('  • Tab completion support')
     print('  • Type "help" for interactive commands')
     print('')
@@ -251,6 +521,8 @@ def main():
     """
     Main function to handle command line arguments and start the script
     """
+    import argparse
+    
     executor = None
     
     try:
@@ -269,6 +541,12 @@ def main():
             dest='file_path',
             help='Execute SQL from file'
         )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=INTERACTIVE_PAGE_SIZE,
+            help=f'Rows per page for SELECT queries in interactive mode, 0 to disable paging (default: {INTERACTIVE_PAGE_SIZE})'
+        )
         parser.add_argument(
             '--help-extended',
             action='store_true',
@@ -286,7 +564,7 @@ def main():
         print('🔌 Initializing database connection...')
         logger.info("Initializing database connection")
         
-        executor = QueryExecutor()
+        executor = QueryExecutor(page_size=args.page_size)
         executor.db_manager.initialize()
         
         logger.info("Database connection established successfully")
@@ -317,18 +595,15 @@ def main():
 # Backward compatibility functions for MCP server
 def initialize_database():
     """Initialize database (backward compatibility for MCP server)"""
-    from db_connection import initialize_database as init_db
-    init_db()
+    _init_db()
 
 def execute_db_query(sql: str, params=None):
     """Execute database query (backward compatibility for MCP server)"""
-    from db_connection import execute_db_query as exec_query
-    return exec_query(sql, params)
+    return _exec_q(sql, params)
 
 def close_database_connection():
     """Close database connection (backward compatibility for MCP server)"""
-    from db_connection import close_database_connection as close_db
-    close_db()
+    _close_db()
 
 
 if __name__ == '__main__':
@@ -10,10 +10,13 @@ Provides centralized logging configuration based on environment variables:
 """
 
 import os
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 try:
     from project_utils import get_project_path_as_path
@@ -22,18 +25,101 @@ except ImportError:
     def get_project_path_as_path():
         return Path.cwd()
 
+# Level names understood by the logging module (DEBUG, INFO, WARN, FATAL, ...)
+_LEVEL_NAMES = logging.getLevelNamesMapping()
+
 def _get_log_level(level_str: str) -> int:
     """Convert string log level to logging constant"""
-    level_map = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'WARN': logging.WARNING,
-        'ERROR': logging.ERROR,
-        'CRITICAL': logging.CRITICAL,
-        'FATAL': logging.CRITICAL
-    }
-    return level_map.get(level_str.upper(), logging.ERROR)
+    return _LEVEL_NAMES.get(level_str.upper(), logging.ERROR)
+
+def _resolve_log_path(log_file: Optional[str]) -> Optional[Path]:
+    """Resolve the log file path relative to the project directory"""
+    if not log_file:
+        return None
+    
+    log_path = Path(log_file)
+    if not log_path.is_absolute():
+        # Make relative paths relative to project directory
+        log_path = get_project_path_as_path() / log_path
+    
+    return log_path
+
+def invalidate() -> None:
+    """
+    Re-read the logging settings from the environment.
+    
+    Call this after the environment changes (e.g. a .env file was loaded) so
+    loggers configured afterwards pick up the new values.
+    """
+    global _LOG_FILE, _LOG_PATH, _LOG_LEVEL_NAME, _LOG_LEVEL
+    _LOG_FILE = os.environ.get('MCP_POSTGRESQL_LOG_FILE', '').strip() or None
+    _LOG_PATH = _resolve_log_path(_LOG_FILE)
+    _LOG_LEVEL_NAME = os.environ.get('MCP_POSTGRESQL_LOG_LEVEL', 'error').strip()
+    _LOG_LEVEL = _get_log_level(_LOG_LEVEL_NAME)
+
+# Logging settings, snapshotted once at import (see invalidate())
+invalidate()
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that formats the timestamp once per second, not once per record"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted time), replaced as a whole so threads never see a torn pair
+        self._time_cache = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, formatted = self._time_cache
+        if second != cached_second:
+            formatted = super().formatTime(record, datefmt)
+            self._time_cache = (second, formatted)
+        return formatted
+
+# Formatter shared by all handlers (datefmt has no sub-second part, see above)
+_FORMATTER = _CachedTimeFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Queue handlers in front of each log file's background writer
+_QUEUE_HANDLERS: Dict[Path, QueueHandler] = {}
+
+def _get_file_handler(log_path: Path, log_level: int, formatter: logging.Formatter) -> logging.Handler:
+    """
+    Get the handler that logs to a file without blocking the caller.
+    
+    Records are put on a queue and written by a QueueListener thread, so a
+    logging call never waits on disk. Loggers sharing a log file share one
+    queue and one open file; the queue is drained at exit.
+    
+    Args:
+        log_path: Log file path
+        log_level: Minimum level written to the file
+        formatter: Formatter for file records
+        
+    Returns:
+        QueueHandler feeding the file's writer thread
+    """
+    handler = _QUEUE_HANDLERS.get(log_path)
+    if handler is None:
+        # Create log directory if it doesn't exist
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Create file handler
+        file_handler = logging.FileHandler(str(log_path), mode='a', encoding='utf-8')
+        file_handler.setLevel(log_level)
+        file_handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        
+        handler = QueueHandler(log_queue)
+        handler.setLevel(log_level)
+        _QUEUE_HANDLERS[log_path] = handler
+    return handler
 
 def setup_logging(logger_name: str = "mcp-postgresql") -> logging.Logger:
     """
@@ -51,38 +137,16 @@ def setup_logging(logger_name: str = "mcp-postgresql") -> logging.Logger:
     if logger.hasHandlers():
         return logger
     
-    # Get environment variables
-    log_file = os.getenv('MCP_POSTGRESQL_LOG_FILE', '').strip()
-    log_level_str = os.getenv('MCP_POSTGRESQL_LOG_LEVEL', 'error').strip()
-    
-    # Convert log level
-    log_level = _get_log_level(log_level_str)
+    log_path = _LOG_PATH
+    log_level = _LOG_LEVEL
     logger.setLevel(log_level)
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    formatter = _FORMATTER
     
     # Setup file handler if log file is specified
-    if log_file:
+    if log_path:
         try:
-            # Resolve log file path relative to project directory
-            log_path = Path(log_file)
-            if not log_path.is_absolute():
-                # Make relative paths relative to project directory
-                project_path = get_project_path_as_path()
-                log_path = project_path / log_path
-            
-            # Create log directory if it doesn't exist
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create file handler
-            file_handler = logging.FileHandler(str(log_path), mode='a', encoding='utf-8')
-            file_handler.setLevel(log_level)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            logger.addHandler(_get_file_handler(log_path, log_level, formatter))
             
         except Exception as e:
             # If file logging setup fails, fall back to console logging for this error
@@ -90,11 +154,11 @@ def setup_logging(logger_name: str = "mcp-postgresql") -> logging.Logger:
             console_handler.setLevel(logging.ERROR)
             console_handler.setFormatter(formatter)
             logger.addHandler(console_handler)
-            logger.error(f"Failed to setup file logging to '{log_file}': {e}")
+            logger.error(f"Failed to setup file logging to '{log_path}': {e}")
             return logger
     
     # If no file logging configured, only setup console for ERROR and above
-    if not log_file:
+    if not log_path:
         # Only add console handler for errors when no file logging
         if log_level <= logging.ERROR:
             console_handler = logging.StreamHandler(sys.stderr)
@@ -135,8 +199,7 @@ def is_logging_enabled() -> bool:
     Returns:
         True if MCP_POSTGRESQL_LOG_FILE is set and not empty
     """
-    log_file = os.getenv('MCP_POSTGRESQL_LOG_FILE', '').strip()
-    return bool(log_file)
+    return _LOG_FILE is not None
 
 def get_log_file_path() -> Optional[str]:
     """
@@ -145,17 +208,7 @@ def get_log_file_path() -> Optional[str]:
     Returns:
         Absolute log file path if configured, None otherwise
     """
-    log_file = os.getenv('MCP_POSTGRESQL_LOG_FILE', '').strip()
-    if not log_file:
-        return None
-    
-    log_path = Path(log_file)
-    if not log_path.is_absolute():
-        # Make relative paths relative to project directory
-        project_path = get_project_path_as_path()
-        log_path = project_path / log_path
-    
-    return str(log_path)
+    return str(_LOG_PATH) if _LOG_PATH else None
 
 def get_log_level_name() -> str:
     """
@@ -164,7 +217,7 @@ def get_log_level_name() -> str:
     Returns:
         Log level name (default: 'error')
     """
-    return os.getenv('MCP_POSTGRESQL_LOG_LEVEL', 'error').strip()
+    return _LOG_LEVEL_NAME
 
 # Create default logger instance for module-level usage
 default_logger = setup_logging()
\ No newline at end of file
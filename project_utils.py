@@ -4,15 +4,21 @@ Project utilities for global project path management.
 @author sebcbi1
 """
 import os
+import functools
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
 def get_project_path() -> str:
     """
     Returns the global project path from MCP_POSTGRESQL_CWD environment variable.
     Falls back to current working directory if MCP_POSTGRESQL_CWD is not set.
+
+    The path is resolved once per process; call get_project_path.cache_clear()
+    (and get_project_path_as_path.cache_clear()) after changing it.
     """
     return os.getenv('MCP_POSTGRESQL_CWD', os.getcwd())
 
+@functools.lru_cache(maxsize=1)
 def get_project_path_as_path() -> Path:
     """
     Returns the global project path as a Path object.
@@ -0,0 +1,49 @@
+"""Tests for the SQL scanner behind read-only validation and statement caching"""
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("dotenv")
+
+import db_connection
+
+
+@pytest.mark.parametrize("sql", [
+    # '$' inside an identifier does not open a dollar quote
+    "SELECT 1 AS a$b$, $b$ ' $b$ AS c; DROP TABLE t; -- '",
+    "SELECT 1 AS a$$, $$ ' $$ AS c; DELETE FROM t; -- '",
+    # Line comments end at a carriage return too
+    "SELECT 1 --\r; DROP TABLE t",
+    # Block comments nest
+    "SELECT 1 /* /* */ ' */; DROP TABLE t; -- '",
+    # '$' right after a number is ambiguous: literals after it are not blanked
+    "SELECT 1$a$ ' $a$; DROP TABLE t; --'",
+    # Non-ASCII spaces are identifier characters to the server
+    "SELECT 1 AS a $b$, $b$ ' $b$ AS c; DROP TABLE t; -- '",
+])
+def test_hidden_write_is_rejected(sql):
+    with pytest.raises(Exception):
+        db_connection.validate_read_only_query(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 'DROP TABLE t' AS a",
+    "SELECT 1 AS a$b$ FROM t",
+    "SELECT $q$it's$q$ -- DROP TABLE t",
+    "SELECT 1 /* outer /* DELETE */ UPDATE */",
+])
+def test_read_only_query_is_accepted(sql):
+    assert db_connection.validate_read_only_query(sql)
+
+
+def test_cache_key_keeps_dollar_quoted_whitespace_after_dollar_identifier():
+    # a$b$ is a column name, so $b$...$b$ is the quoted text whose spacing matters
+    first = db_connection._statement_cache_key("SELECT 1 AS a$b$, $b$x  y$b$", [])
+    second = db_connection._statement_cache_key("SELECT 1 AS a$b$, $b$x y$b$", [])
+    assert first != second
+
+
+def test_cache_key_ignores_formatting_outside_quoted_text():
+    first = db_connection._statement_cache_key("SELECT a,\n       b -- columns\nFROM t", [])
+    second = db_connection._statement_cache_key("SELECT a, b FROM t", [])
+    assert first == second